@@ -3,12 +3,22 @@ MARBEFES BBT Database - Standalone Refactored Version
 This works immediately without any dependencies on other files
 """
 
-from flask import Flask, render_template_string, jsonify
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import requests
-from xml.etree import ElementTree as ET
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import hashlib
+import io
+import json
+import math
 import os
 import sys
+import time
+from functools import lru_cache
+
+from utils.json_provider import install_json_provider
 
 # Try to import vector support if available
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
@@ -23,10 +33,268 @@ except ImportError:
     VECTOR_SUPPORT = False
     print("Vector support disabled - optional dependency")
 
+# libxml2-backed XML parsing when lxml is installed
+try:
+    from lxml import etree as ET
+
+    # Capabilities documents never need DTDs, entities or the network;
+    # skipping them avoids that work and closes off XXE, and dropping
+    # whitespace/comment/PI nodes keeps the streamed tree small
+    _ITERPARSE_OPTIONS = {
+        "resolve_entities": False,
+        "no_network": True,
+        "load_dtd": False,
+        "remove_blank_text": True,
+        "remove_comments": True,
+        "remove_pis": True,
+    }
+except ImportError:
+    from xml.etree import ElementTree as ET
+
+    _ITERPARSE_OPTIONS = {}
+
+# Faster JSON encoding when orjson is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Shared HTTP session so repeated WMS requests reuse pooled keep-alive
+# connections; transient connection errors and 5xx replies are retried
+wms_session = requests.Session()
+wms_session.headers.update(
+    {
+        "User-Agent": "MARBEFES-BBT-Database/1.0",
+        "Accept-Encoding": "gzip, deflate",
+    }
+)
+_wms_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)
+    ),
+)
+wms_session.mount("https://", _wms_adapter)
+wms_session.mount("http://", _wms_adapter)
+
+# Static file contents keyed by path -> ((mtime_ns, size), content)
+_file_cache = {}
+
+
+def read_cached_file(path):
+    """Read a text file, reusing the last read while mtime/size match"""
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _file_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with open(path, "r") as f:
+        content = f.read()
+    _file_cache[path] = (key, content)
+    return content
+
+
+def drop_null_properties(geojson):
+    """Return a copy of a FeatureCollection without null/NaN properties"""
+    features = []
+    for feature in geojson.get("features", []):
+        properties = feature.get("properties") or {}
+        # pandas uses float NaN for missing values; other types (arrays,
+        # pd.NA) are kept as-is rather than compared for truthiness
+        compact = {
+            k: v
+            for k, v in properties.items()
+            if v is not None and not (isinstance(v, float) and math.isnan(v))
+        }
+        features.append({**feature, "properties": compact})
+    return {**geojson, "features": features}
+
+
+def dumps_json(obj):
+    """
+    Serialize to compact JSON bytes, using orjson when available. Values
+    neither encoder handles natively (Decimal, dates, UUIDs, datetime
+    subclasses such as pd.Timestamp) go through Flask's default hook, as
+    they would with jsonify.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=DefaultJSONProvider.default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(
+        obj, default=DefaultJSONProvider.default, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _round_coordinates(coords, decimals):
+    """Round a (possibly nested) GeoJSON coordinate array"""
+    if coords and isinstance(coords[0], (list, tuple)):
+        return [_round_coordinates(c, decimals) for c in coords]
+    return [round(c, decimals) for c in coords]
+
+
+def _quantize_geometry(geometry, decimals):
+    """Return a copy of a GeoJSON geometry with rounded coordinates"""
+    if not geometry:
+        return geometry
+    if geometry.get("type") == "GeometryCollection":
+        return {
+            **geometry,
+            "geometries": [
+                _quantize_geometry(g, decimals)
+                for g in geometry.get("geometries", [])
+            ],
+        }
+    return {
+        **geometry,
+        "coordinates": _round_coordinates(
+            geometry.get("coordinates", []), decimals
+        ),
+    }
+
+
+def quantize_geojson(geojson, decimals):
+    """Return a copy of a FeatureCollection with rounded coordinates"""
+    features = [
+        {**f, "geometry": _quantize_geometry(f.get("geometry"), decimals)}
+        for f in geojson.get("features", [])
+    ]
+    return {**geojson, "features": features}
+
+
+@lru_cache(maxsize=1)
+def sample_layers_payload():
+    """Serialized sample layer list and its ETag, built once"""
+    from sample_vector_data import get_sample_vector_layers
+
+    payload = dumps_json({"layers": get_sample_vector_layers()})
+    return payload, hashlib.md5(payload).hexdigest()
+
+
+@lru_cache(maxsize=16)
+def sample_geojson_payload(name):
+    """Serialized sample GeoJSON for a layer, or None if it does not exist"""
+    from sample_vector_data import get_sample_geojson
+
+    geojson = get_sample_geojson(name)
+    return dumps_json(geojson) if geojson else None
+
+
+def ndjson_feature_lines(geojson):
+    """
+    Encode each GeoJSON Feature as one newline-terminated line (NDJSON).
+    Every line is encoded before returning, so an unencodable feature
+    fails before a response is started.
+    """
+    return [
+        dumps_json(feature) + b"\n" for feature in geojson.get("features", [])
+    ]
+
+
+# Number of WMS layers offered in the layer picker
+MAX_LAYERS_DISPLAY = 50
+
+# Namespace-agnostic matching, computed once: a tag is a WMS Layer whether
+# it is unqualified or "{http://www.opengis.net/wms}Layer", and a Layer's
+# Name/Title/Abstract children are matched on their local name
+_LAYER_TAG = "Layer"
+_LAYER_TAG_SUFFIX = "}" + _LAYER_TAG
+_NAME_FIELD = "Name"
+_TITLE_FIELD = "Title"
+_ABSTRACT_FIELD = "Abstract"
+_LAYER_FIELDS = frozenset((_NAME_FIELD, _TITLE_FIELD, _ABSTRACT_FIELD))
+
+# Placeholder for a Layer whose entry is not known yet
+_PENDING = object()
+
+# Seconds a successfully fetched WMS layer list is reused
+WMS_CACHE_TTL = int(os.environ.get("WMS_CACHE_TTL", "300"))
+
+# Base URL -> (monotonic expiry time, layers)
+_wms_layers_cache = {}
+
+
+@lru_cache(maxsize=4)
+def parse_wms_layers(xml_content, max_layers=MAX_LAYERS_DISPLAY):
+    """
+    Parse name/title/description of the first max_layers named layers in a
+    GetCapabilities document, in document order (a group layer precedes
+    its children). The document is streamed and parsing stops once enough
+    layers are collected. Cached on the raw bytes, so an unchanged document
+    is only parsed once. Callers must not mutate the result.
+    """
+    layers = []
+    # One slot per Layer in document order, _PENDING until its Name, Title
+    # and Abstract are known, then its entry (None if it has no name)
+    slots = []
+    # [slot index, depth, child texts] for each enclosing open Layer
+    open_layers = []
+    resolved = 0
+    depth = 0
+
+    def resolve(layer):
+        index, _, fields = layer
+        if slots[index] is _PENDING:
+            name = fields.get(_NAME_FIELD)
+            slots[index] = (
+                {
+                    "name": name,
+                    "title": fields.get(_TITLE_FIELD, name),
+                    "description": fields.get(_ABSTRACT_FIELD, ""),
+                }
+                if name
+                else None
+            )
+
+    events = ET.iterparse(
+        io.BytesIO(xml_content),
+        events=("start", "end"),
+        **_ITERPARSE_OPTIONS,
+    )
+    for event, elem in events:
+        tag = elem.tag
+        # lxml yields comments/PIs whose tag is not a string
+        if not isinstance(tag, str):
+            continue
+        is_layer = tag == _LAYER_TAG or tag.endswith(_LAYER_TAG_SUFFIX)
+
+        if event == "start":
+            depth += 1
+            if is_layer:
+                # Name, Title and Abstract precede nested Layers, so the
+                # parent is complete once its first child Layer starts
+                if open_layers:
+                    resolve(open_layers[-1])
+                slots.append(_PENDING)
+                open_layers.append((len(slots) - 1, depth, {}))
+            continue
+
+        if is_layer:
+            resolve(open_layers.pop())
+            # Drop what has been read; the entry is already extracted
+            elem.clear()
+        elif open_layers and depth == open_layers[-1][1] + 1:
+            field = tag[tag.rfind("}") + 1 :]
+            if field in _LAYER_FIELDS:
+                open_layers[-1][2].setdefault(field, elem.text)
+        depth -= 1
+
+        while resolved < len(slots) and slots[resolved] is not _PENDING:
+            if slots[resolved] is not None:
+                layers.append(slots[resolved])
+            resolved += 1
+        if len(layers) >= max_layers:
+            break
+    return layers[:max_layers]
+
 
 def create_app():
     app = Flask(__name__)
     app.config["SECRET_KEY"] = "dev-key"
+    install_json_provider(app)
     CORS(app)
 
     # Configuration
@@ -35,57 +303,46 @@ def create_app():
     )
 
     def get_wms_layers(base_url):
-        """Fetch WMS layers"""
+        """Fetch WMS layers, reusing a successful result for WMS_CACHE_TTL"""
+        cached = _wms_layers_cache.get(base_url)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+
         try:
-            response = requests.get(
+            response = wms_session.get(
                 base_url,
                 params={
                     "service": "WMS",
                     "version": "1.3.0",
                     "request": "GetCapabilities",
                 },
-                timeout=10,
+                # Short connect timeout: the adapter retries connects, so an
+                # unreachable server costs ~3 attempts of 3 s, not 3 of 10 s
+                timeout=(3.05, 10),
             )
 
             if response.status_code == 200:
-                root = ET.fromstring(response.content)
-                for elem in root.iter():
-                    if "}" in elem.tag:
-                        elem.tag = elem.tag.split("}")[1]
-
-                layers = []
-                for layer in root.findall(".//Layer"):
-                    name = layer.find("Name")
-                    if name is not None and name.text:
-                        title_elem = layer.find("Title")
-                        abstract_elem = layer.find("Abstract")
-                        layers.append(
-                            {
-                                "name": name.text,
-                                "title": (
-                                    title_elem.text
-                                    if title_elem is not None
-                                    else name.text
-                                ),
-                                "description": (
-                                    abstract_elem.text
-                                    if abstract_elem is not None
-                                    else ""
-                                ),
-                            }
-                        )
-                print("\n[DEBUG] EMODNET layers found:")
-                for layer in layers:
-                    print(f"  - {layer['name']}: {layer['title']}")
-                print(f"Total layers found: {len(layers)}\n")
-                return layers[:50]
+                layers = parse_wms_layers(response.content)
+                # One buffered write instead of a print per layer
+                lines = ["", "[DEBUG] EMODNET layers found:"]
+                lines.extend(
+                    f"  - {layer['name']}: {layer['title']}"
+                    for layer in layers
+                )
+                lines.append(f"Total layers found: {len(layers)}\n")
+                sys.stdout.write("\n".join(lines) + "\n")
+                _wms_layers_cache[base_url] = (
+                    time.monotonic() + WMS_CACHE_TTL,
+                    layers,
+                )
+                return layers
         except Exception:
             return []
 
-    @app.route("/")
-    def index():
-        html = (
-            """<!DOCTYPE html>
+    # The page has no template logic, so it is built and encoded once per
+    # app instead of being compiled by Jinja on every request
+    index_html = (
+        """<!DOCTYPE html>
 <html>
 <head>
     <title>MARBEFES BBT - Refactored</title>
@@ -156,7 +413,7 @@ def create_app():
         let currentOpacity = 0.7;
 
         // Load WMS layers
-        fetch('/api/layers')
+        fetch('api/layers')
             .then(r => r.json())
             .then(data => {
                 const sel = document.getElementById('layers');
@@ -170,7 +427,7 @@ def create_app():
             });
 
         // Load vector layers
-        fetch('/api/vector/layers')
+        fetch('api/vector/layers')
             .then(r => r.json())
             .then(data => {
                 const sel = document.getElementById('vectorLayers');
@@ -190,8 +447,8 @@ def create_app():
             document.getElementById('status').textContent = 'Loading...';
             
             wmsLayer = L.tileLayer.wms("""
-            " + WMS_BASE_URL + "
-            """, {
+        + json.dumps(WMS_BASE_URL)
+        + """, {
                 layers: name,
                 format: 'image/png',
                 transparent: true,
@@ -214,7 +471,7 @@ def create_app():
 
             document.getElementById('status').textContent = 'Loading vector layer...';
 
-            fetch(`/api/vector/layer/${layerName}`)
+            fetch(`api/vector/layer/${layerName}`)
                 .then(r => r.json())
                 .then(geojson => {
                     vectorLayer = L.geoJSON(geojson, {
@@ -292,8 +549,14 @@ def create_app():
     </script>
 </body>
 </html>"""
-        )
-        return render_template_string(html, WMS_BASE_URL=WMS_BASE_URL)
+    ).encode("utf-8")
+    index_etag = hashlib.md5(index_html).hexdigest()
+
+    @app.route("/")
+    def index():
+        response = Response(index_html, mimetype="text/html")
+        response.set_etag(index_etag)
+        return response.make_conditional(request)
 
     @app.route("/api/layers")
     def api_layers():
@@ -309,28 +572,54 @@ def create_app():
     @app.route("/api/vector/layers")
     def api_vector_layers():
         if not VECTOR_SUPPORT:
-            # Fallback to sample data when full vector support unavailable
-            from sample_vector_data import get_sample_vector_layers
-            return jsonify({"layers": get_sample_vector_layers()})
+            # Fallback to the static sample list, serialized once; the ETag
+            # lets repeat polls be answered with 304 Not Modified
+            payload, etag = sample_layers_payload()
+            response = Response(payload, mimetype="application/json")
+            response.set_etag(etag)
+            return response.make_conditional(request)
         return jsonify({"layers": get_vector_layers_summary()})
 
     @app.route("/api/vector/layer/<path:name>")
     def api_vector_layer(name):
+        ndjson = request.args.get("format") == "ndjson"
+        precision = request.args.get("precision", type=int)
+        if not VECTOR_SUPPORT and not ndjson and precision is None:
+            # Sample layers never change; serve their cached bytes directly
+            payload = sample_geojson_payload(name)
+            if payload is None:
+                return jsonify({"error": "Layer not found"}), 404
+            return Response(payload, mimetype="application/json")
+
         if not VECTOR_SUPPORT:
             # Fallback to sample data when full vector support unavailable
             from sample_vector_data import get_sample_geojson
             geojson = get_sample_geojson(name)
-            return (
-                jsonify(geojson)
-                if geojson
-                else (jsonify({"error": "Layer not found"}), 404)
+            if not geojson:
+                return jsonify({"error": "Layer not found"}), 404
+        else:
+            geojson = get_vector_layer_geojson(name)
+            if not geojson:
+                return jsonify({"error": "Not found"}), 404
+            # Sparse attribute tables carry mostly-null columns; omit them
+            geojson = drop_null_properties(geojson)
+
+        if precision is not None:
+            # Web maps rarely need full float64 precision; 6 decimals is ~10cm
+            geojson = quantize_geojson(geojson, max(0, min(precision, 15)))
+
+        if ndjson:
+            # Line-delimited features are sent one per chunk so the client
+            # can render progressively; they are encoded up front so an
+            # unencodable value is a 500 rather than a truncated 200
+            return Response(
+                ndjson_feature_lines(geojson),
+                mimetype="application/x-ndjson",
             )
-        geojson = get_vector_layer_geojson(name)
-        return (
-            jsonify(geojson)
-            if geojson
-            else (jsonify({"error": "Not found"}), 404)
-        )
+        # The layer is already fully in memory, so encode it in one call
+        # before responding: an unencodable value then surfaces as a 500
+        # rather than a truncated 200 body
+        return Response(dumps_json(geojson), mimetype="application/json")
 
     @app.route("/health")
     def health():
@@ -338,8 +627,7 @@ def create_app():
 
     @app.route("/debug")
     def debug():
-        with open("debug_vectors.html", "r") as f:
-            return f.read()
+        return read_cached_file("debug_vectors.html")
 
     return app
 
@@ -349,6 +637,9 @@ if __name__ == "__main__":
     print("\n" + "=" * 60)
     print("MARBEFES BBT - Standalone Refactored Version")
     print("=" * 60)
+    # Debug mode (reloader + debugger) only when explicitly requested
+    debug = os.environ.get("FLASK_DEBUG", "0") == "1"
     print("Starting on http://localhost:5000")
+    print(f"Debug mode: {debug}")
     print("-" * 60)
-    app.run(debug=True, port=5000)
+    app.run(debug=debug, port=5000)
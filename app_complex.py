@@ -9,6 +9,7 @@ from flask_cors import CORS
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 from config import config
+from utils.json_provider import install_json_provider
 
 
 def create_app(config_name=None):
@@ -21,6 +22,14 @@ def create_app(config_name=None):
     config_name = config_name or os.getenv("FLASK_ENV", "development")
     app.config.from_object(config[config_name])
 
+    # Serialize API responses (layer lists, GeoJSON) with orjson if present
+    install_json_provider(app)
+
+    # Flask 2.3 reads JSON options from the provider, not app.config
+    app.json.sort_keys = app.config["JSON_SORT_KEYS"]
+    if app.config["JSONIFY_PRETTYPRINT_REGULAR"] is not None:
+        app.json.compact = not app.config["JSONIFY_PRETTYPRINT_REGULAR"]
+
     # Initialize extensions
     initialize_extensions(app)
 
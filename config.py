@@ -56,6 +56,10 @@ class Config:
     LOG_MAX_BYTES = 10 * 1024 * 1024  # 10MB
     LOG_BACKUP_COUNT = 10
 
+    # JSON responses (mapped onto app.json by the application factory)
+    JSON_SORT_KEYS = True
+    JSONIFY_PRETTYPRINT_REGULAR = None  # None: pretty-print only in debug
+
     # Performance settings
     REQUEST_TIMEOUT = 30  # seconds
     MAX_WORKERS = 4
@@ -118,6 +122,10 @@ class ProductionConfig(Config):
     SESSION_COOKIE_SAMESITE = "Lax"
     PERMANENT_SESSION_LIFETIME = 3600
 
+    # Skip key sorting and indentation on every jsonify call
+    JSON_SORT_KEYS = False
+    JSONIFY_PRETTYPRINT_REGULAR = False
+
 
 class TestingConfig(Config):
     """Testing configuration"""
@@ -125,6 +133,8 @@ class TestingConfig(Config):
     TESTING = True
     WTF_CSRF_ENABLED = False
     CACHE_TYPE = "null"
+    JSON_SORT_KEYS = False
+    JSONIFY_PRETTYPRINT_REGULAR = False
 
 
 # Configuration dictionary
@@ -4,6 +4,7 @@ Vector data blueprint for handling vector layer endpoints
 from flask import Blueprint, jsonify, request, current_app
 from werkzeug.exceptions import BadRequest
 import logging
+import math
 
 from utils.validators import validate_layer_name, sanitize_url_parameter
 from utils.cache import cached
@@ -55,6 +56,12 @@ def get_vector_layer_geojson(layer_name):
         
         # Get optional simplification parameter
         simplify = request.args.get('simplify', type=float)
+        if simplify is not None and not math.isfinite(simplify):
+            raise BadRequest("simplify must be a finite number")
+        if simplify and simplify > 0:
+            # Snap to a power-of-two bucket so near-identical tolerances from
+            # neighbouring zoom levels share one cached simplified layer
+            simplify = 2 ** math.floor(math.log2(simplify))
         
         from services.vector_service import VectorService
         vector_service = VectorService(current_app.config)
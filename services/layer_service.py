@@ -4,7 +4,9 @@ Combines WMS, HELCOM, and vector layers
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
+from flask import current_app
 from services.wms_service import WMSService
 from utils.cache import cached
 
@@ -39,24 +41,46 @@ class LayerService:
             Dictionary with layers from different sources
         """
         try:
-            # Get WMS layers
-            wms_layers = self.wms_service.get_available_layers()
-
-            # Get HELCOM layers
-            helcom_layers = self.helcom_service.get_helcom_layers()
-
-            # Get vector layers if available
-            vector_layers = []
+            # Resolve the optional vector loader up front so its summary can
+            # be built alongside the network fetches below
+            get_vector_layers_summary = None
             if self.config.get("ENABLE_VECTOR_SUPPORT", False):
                 try:
                     from emodnet_viewer.utils.vector_loader import (
                         get_vector_layers_summary,
                     )
-
-                    vector_layers = get_vector_layers_summary()
                 except ImportError:
                     logger.warning("Vector support not available")
 
+            # Fetch WMS/HELCOM capabilities and load vector layers
+            # concurrently; each is I/O-bound (network or GDAL), so threads
+            # overlap the waits instead of running them back to back
+            app = current_app._get_current_object()
+
+            def in_app_context(func):
+                with app.app_context():
+                    return func()
+
+            with ThreadPoolExecutor(
+                max_workers=self.config.get("MAX_WORKERS", 4)
+            ) as executor:
+                wms_future = executor.submit(
+                    in_app_context, self.wms_service.get_available_layers
+                )
+                helcom_future = executor.submit(
+                    in_app_context, self.helcom_service.get_helcom_layers
+                )
+                vector_future = (
+                    executor.submit(in_app_context, get_vector_layers_summary)
+                    if get_vector_layers_summary is not None
+                    else None
+                )
+                wms_layers = wms_future.result()
+                helcom_layers = helcom_future.result()
+                vector_layers = (
+                    vector_future.result() if vector_future is not None else []
+                )
+
             return {
                 "wms": wms_layers,
                 "helcom": helcom_layers,
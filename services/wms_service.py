@@ -6,6 +6,7 @@ Handles all WMS-related operations with proper error handling and caching
 import requests
 from xml.etree import ElementTree as ET
 import logging
+import time
 from typing import List, Dict, Optional
 from urllib.parse import urlencode
 
@@ -21,6 +22,15 @@ class ServiceError(Exception):
 class WMSService:
     """Service for handling WMS operations"""
 
+    # Maximum number of layers returned from a capabilities document
+    MAX_LAYERS = 20
+
+    # Seconds to skip an endpoint after a failed or unparsable fetch
+    FAILURE_BACKOFF = 60
+
+    # Base URL -> monotonic time until which capabilities are not retried
+    _failed_until: Dict[str, float] = {}
+
     def __init__(self, base_url: str, version: str = "1.3.0"):
         self.base_url = base_url
         self.version = version
@@ -28,6 +38,8 @@ class WMSService:
         self.session.headers.update(
             {"User-Agent": "MARBEFES-BBT-Database/1.0"}
         )
+        self._capabilities: Optional[ET.Element] = None
+        self._layer_index: Optional[Dict[str, ET.Element]] = None
 
     def get_available_layers(self) -> List[Dict[str, str]]:
         """
@@ -88,16 +100,33 @@ class WMSService:
             "request": "GetCapabilities",
         }
 
+        # Fail fast while a recent failure is remembered instead of waiting
+        # on the timeout of an unreachable server for every request
+        retry_at = self._failed_until.get(self.base_url)
+        if retry_at is not None and time.monotonic() < retry_at:
+            raise ServiceError(
+                f"Capabilities unavailable for {self.base_url}; "
+                "recent fetch failed"
+            )
+
         try:
             response = self.session.get(
                 self.base_url, params=params, timeout=10
             )
             response.raise_for_status()
+            self._failed_until.pop(self.base_url, None)
             return response.content
         except requests.RequestException as e:
             logger.error(f"Failed to fetch capabilities: {e}")
+            self._mark_failed()
             raise ServiceError(f"Failed to fetch capabilities: {e}")
 
+    def _mark_failed(self) -> None:
+        """Remember a capabilities failure for FAILURE_BACKOFF seconds"""
+        self._failed_until[self.base_url] = (
+            time.monotonic() + self.FAILURE_BACKOFF
+        )
+
     def get_legend_url(self, layer_name: str) -> str:
         """
         Generate legend URL for a specific layer
@@ -173,17 +202,29 @@ class WMSService:
         """
         Internal method to fetch and parse GetCapabilities
 
+        The parsed document is kept for the lifetime of the service
+        instance, so layer, bounds and scale-hint lookups share one fetch
+
         Returns:
             Parsed XML root element
         """
+        if self._capabilities is not None:
+            return self._capabilities
+
         xml_content = self.get_capabilities_xml()
-        root = ET.fromstring(xml_content)
+        try:
+            root = ET.fromstring(xml_content)
+        except ET.ParseError as e:
+            logger.error(f"Invalid capabilities document: {e}")
+            self._mark_failed()
+            raise ServiceError(f"Invalid capabilities document: {e}")
 
         # Remove namespaces for easier parsing
         for elem in root.iter():
             if "}" in elem.tag:
                 elem.tag = elem.tag.split("}")[1]
 
+        self._capabilities = root
         return root
 
     def _parse_layers(self, root: ET.Element) -> List[Dict[str, str]]:
@@ -198,31 +239,56 @@ class WMSService:
         """
         layers = []
 
-        for layer in root.findall(".//Layer"):
-            name_elem = layer.find("Name")
+        for layer in root.iterfind(".//Layer"):
+            name = layer.findtext("Name")
+            # Skip unnamed and workspace-prefixed layers before looking
+            # at anything else
+            if not name or ":" in name:
+                continue
+
             title_elem = layer.find("Title")
             abstract_elem = layer.find("Abstract")
+            layers.append(
+                {
+                    "name": name,
+                    "title": (
+                        title_elem.text if title_elem is not None else name
+                    ),
+                    "description": (
+                        abstract_elem.text
+                        if abstract_elem is not None
+                        else ""
+                    ),
+                }
+            )
+            if len(layers) == self.MAX_LAYERS:
+                break
 
-            if name_elem is not None and name_elem.text:
-                # Skip workspace-prefixed names for now
-                if ":" not in name_elem.text:
-                    layers.append(
-                        {
-                            "name": name_elem.text,
-                            "title": (
-                                title_elem.text
-                                if title_elem is not None
-                                else name_elem.text
-                            ),
-                            "description": (
-                                abstract_elem.text
-                                if abstract_elem is not None
-                                else ""
-                            ),
-                        }
-                    )
+        return layers
+
+    def _get_layer_element(self, layer_name: str) -> Optional[ET.Element]:
+        """
+        Look up a Layer element by name
 
-        return layers[:20] if layers else []  # Limit results
+        The name -> element index is built once per service instance, so
+        repeated lookups do not rescan every Layer in the document
+
+        Args:
+            layer_name: Name of the layer
+
+        Returns:
+            Matching Layer element or None
+        """
+        if self._layer_index is None:
+            index = {}
+            for layer in self._get_capabilities().findall(".//Layer"):
+                name_elem = layer.find("Name")
+                if name_elem is not None and name_elem.text:
+                    # Keep the first occurrence, matching the old scan order
+                    index.setdefault(name_elem.text, layer)
+            self._layer_index = index
+
+        return self._layer_index.get(layer_name)
 
     def get_layer_bounds(self, layer_name: str) -> Optional[List[float]]:
         """
@@ -235,29 +301,26 @@ class WMSService:
             Bounds as [west, south, east, north] or None
         """
         try:
-            capabilities = self._get_capabilities()
-
-            for layer in capabilities.findall(".//Layer"):
-                name_elem = layer.find("Name")
-                if name_elem is not None and name_elem.text == layer_name:
-                    # Look for bounding box
-                    bbox = layer.find("EX_GeographicBoundingBox")
-                    if bbox is not None:
-                        west = float(bbox.find("westBoundLongitude").text)
-                        south = float(bbox.find("southBoundLatitude").text)
-                        east = float(bbox.find("eastBoundLongitude").text)
-                        north = float(bbox.find("northBoundLatitude").text)
-                        return [west, south, east, north]
-
-                    # Try alternative format
-                    bbox = layer.find("LatLonBoundingBox")
-                    if bbox is not None:
-                        return [
-                            float(bbox.get("minx")),
-                            float(bbox.get("miny")),
-                            float(bbox.get("maxx")),
-                            float(bbox.get("maxy")),
-                        ]
+            layer = self._get_layer_element(layer_name)
+            if layer is not None:
+                # Look for bounding box
+                bbox = layer.find("EX_GeographicBoundingBox")
+                if bbox is not None:
+                    west = float(bbox.find("westBoundLongitude").text)
+                    south = float(bbox.find("southBoundLatitude").text)
+                    east = float(bbox.find("eastBoundLongitude").text)
+                    north = float(bbox.find("northBoundLatitude").text)
+                    return [west, south, east, north]
+
+                # Try alternative format
+                bbox = layer.find("LatLonBoundingBox")
+                if bbox is not None:
+                    return [
+                        float(bbox.get("minx")),
+                        float(bbox.get("miny")),
+                        float(bbox.get("maxx")),
+                        float(bbox.get("maxy")),
+                    ]
 
         except Exception as e:
             logger.error(f"Error getting layer bounds: {e}")
@@ -279,20 +342,15 @@ class WMSService:
         result = {"min_scale": None, "max_scale": None}
 
         try:
-            capabilities = self._get_capabilities()
-
-            for layer in capabilities.findall(".//Layer"):
-                name_elem = layer.find("Name")
-                if name_elem is not None and name_elem.text == layer_name:
-                    min_scale = layer.find("MinScaleDenominator")
-                    max_scale = layer.find("MaxScaleDenominator")
-
-                    if min_scale is not None:
-                        result["min_scale"] = float(min_scale.text)
-                    if max_scale is not None:
-                        result["max_scale"] = float(max_scale.text)
-
-                    break
+            layer = self._get_layer_element(layer_name)
+            if layer is not None:
+                min_scale = layer.find("MinScaleDenominator")
+                max_scale = layer.find("MaxScaleDenominator")
+
+                if min_scale is not None:
+                    result["min_scale"] = float(min_scale.text)
+                if max_scale is not None:
+                    result["max_scale"] = float(max_scale.text)
 
         except Exception as e:
             logger.error(f"Error getting layer scale hints: {e}")
@@ -22,6 +22,8 @@ from .cache import (
     CacheManager,
 )
 
+from .json_provider import OrjsonProvider, install_json_provider
+
 __all__ = [
     # Validators
     "validate_layer_name",
@@ -39,4 +41,7 @@ __all__ = [
     "cached",
     "cache_key_for_request",
     "CacheManager",
+    # JSON
+    "OrjsonProvider",
+    "install_json_provider",
 ]
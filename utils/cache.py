@@ -5,6 +5,7 @@ Simple caching utilities for the application
 import time
 import hashlib
 import json
+from collections import OrderedDict
 from functools import wraps
 from typing import Any, Optional, Dict
 import logging
@@ -13,17 +14,19 @@ logger = logging.getLogger(__name__)
 
 
 class SimpleCache:
-    """Simple in-memory cache implementation"""
+    """Simple in-memory LRU cache with per-entry TTL"""
 
-    def __init__(self, ttl: int = 3600):
+    def __init__(self, ttl: int = 3600, max_size: int = 1000):
         """
         Initialize cache
 
         Args:
             ttl: Time to live in seconds (default 1 hour)
+            max_size: Maximum number of entries before the oldest is evicted
         """
-        self.cache: Dict[str, tuple] = {}
+        self.cache: "OrderedDict[str, tuple]" = OrderedDict()
         self.ttl = ttl
+        self.max_size = max_size
         self.hits = 0
         self.misses = 0
 
@@ -40,6 +43,8 @@ class SimpleCache:
         if key in self.cache:
             value, timestamp = self.cache[key]
             if time.time() - timestamp < self.ttl:
+                # Mark as most recently used so eviction is true LRU
+                self.cache.move_to_end(key)
                 self.hits += 1
                 logger.debug(f"Cache hit for key: {key}")
                 return value
@@ -60,11 +65,12 @@ class SimpleCache:
             value: Value to cache
         """
         self.cache[key] = (value, time.time())
+        self.cache.move_to_end(key)
         logger.debug(f"Cached value for key: {key}")
 
-        # Simple cleanup - remove expired entries periodically
-        if len(self.cache) > 1000:  # Arbitrary threshold
-            self.cleanup()
+        # Evict oldest entries one at a time - O(1) per insert
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
 
     def delete(self, key: str) -> bool:
         """
@@ -118,6 +124,7 @@ class SimpleCache:
 
         return {
             "size": len(self.cache),
+            "max_size": self.max_size,
             "hits": self.hits,
             "misses": self.misses,
             "hit_rate": f"{hit_rate:.2f}%",
@@ -280,6 +287,7 @@ class NullCache:
     def get_stats(self) -> Dict[str, Any]:
         return {
             "size": 0,
+            "max_size": 0,
             "hits": 0,
             "misses": 0,
             "hit_rate": "0.00%",
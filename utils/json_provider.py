@@ -0,0 +1,56 @@
+"""
+orjson-backed JSON provider for Flask
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson"""
+
+    def dumps(self, obj: object, **kwargs) -> str:
+        """
+        Serialize obj to a JSON string
+
+        Args:
+            obj: Object to serialize
+            **kwargs: Options passed by Flask (indent); sort_keys
+                defaults to the provider's sort_keys attribute
+
+        Returns:
+            JSON string
+        """
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON string or bytes"""
+        return orjson.loads(s)
+
+
+def install_json_provider(app) -> bool:
+    """
+    Switch the app to OrjsonProvider when orjson is installed
+
+    Must run before any other app.json options are set, since those are
+    attributes of the provider instance being replaced.
+
+    Args:
+        app: Flask application
+
+    Returns:
+        True if orjson is in use
+    """
+    if orjson is None:
+        return False
+    app.json = OrjsonProvider(app)
+    return True